@@ -1,7 +1,9 @@
+import django
+
 __title__ = 'Django RESTQL'
 __description__ = 'Turn your API made with Django REST Framework(DRF) into a GraphQL like API.'
 __url__ = 'https://yezyilomo.github.io/django-restql'
-__version__ = '1.4.0'
+__version__ = '2.0.0'
 __author__ = 'Yezy Ilomo'
 __author_email__ = 'yezileliilomo@hotmail.com'
 __license__ = 'MIT'
@@ -9,3 +11,7 @@ __copyright__ = 'Copyright 2019 Yezy Ilomo'
 
 # Version synonym
 VERSION = __version__
+
+if django.VERSION < (3, 2):
+    # Newer versions find the app config automatically
+    default_app_config = 'django_restql.apps.RestqlConfig'
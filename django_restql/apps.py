@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RestqlConfig(AppConfig):
+    name = 'django_restql'
+    verbose_name = 'Django RESTQL'
+
+    def ready(self):
+        from .response_cache import connect_invalidation_receivers
+        connect_invalidation_receivers()
@@ -12,7 +12,7 @@ from rest_framework.serializers import (
     SerializerMethodField, ValidationError
 )
 
-from .parser import Query
+from .parser import ALL_FIELDS_QUERY
 from .exceptions import InvalidOperation
 from .operations import ADD, CREATE, REMOVE, UPDATE
 
@@ -34,13 +34,7 @@ class DynamicSerializerMethodField(SerializerMethodField):
             parsed_query = self.parent.restql_nested_parsed_queries[self.field_name]
         else:
             # Include all fields
-            parsed_query = Query(
-                field_name=None,
-                included_fields=["*"],
-                excluded_fields=[],
-                aliases={},
-                arguments={}
-            )
+            parsed_query = ALL_FIELDS_QUERY
         return method(value, parsed_query)
 
 
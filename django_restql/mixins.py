@@ -1,23 +1,72 @@
+from collections import namedtuple
+from hashlib import blake2b
+from threading import Lock
+from types import MappingProxyType
+from weakref import WeakSet
+
+from django import VERSION as DJANGO_VERSION
 from django.db.models import Prefetch, QuerySet
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.fields.related import ManyToManyRel, ManyToOneRel
-from django.http import QueryDict
+from django.db.models.fields.related import (
+    ManyToManyField, ManyToManyRel, ManyToOneRel, OneToOneRel
+)
+from django.http import HttpResponse, QueryDict, StreamingHttpResponse
+from django.test.signals import setting_changed
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _, get_language
 
+from rest_framework.fields import (
+    BooleanField, CharField, FloatField, IntegerField, ReadOnlyField
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.serializers import (
     ListSerializer, Serializer, ValidationError
 )
 
+try:
+    from rest_framework.fields import BigIntegerField
+except ImportError:
+    # For djangorestframework < 3.15
+    BigIntegerField = None
+
 from .exceptions import FieldNotFound, QueryFormatError
 from .fields import (
     ALL_RELATED_OBJS, BaseRESTQLNestedField,
     DynamicSerializerMethodField, TemporaryNestedField
 )
 from .operations import ADD, CREATE, REMOVE, UPDATE
-from .parser import Query, QueryParser
+from .parser import ALL_FIELDS_QUERY, Query, QueryParser
 from .settings import restql_settings
-from .tools import flatten
+from .response_cache import get_generations, get_related_models
+from .tools import (
+    flatten, freeze_mapping, get_local_field_names,
+    get_model_field_names, get_translated_fields
+)
+
+
+# Serializer fields which represent values loaded from the
+# database as they are, so they can be read with `.values()`
+VALUES_FIELD_CLASSES = (
+    BooleanField, CharField, FloatField, IntegerField, ReadOnlyField
+)
+
+# Describes how a queryset should be optimized for a query
+QuerysetPlan = namedtuple(
+    "QuerysetPlan", ("to_select", "to_prefetch", "only_select", "only_fields")
+)
+
+# Field names of a view's serializer, see `get_serializer_meta`
+SerializerMeta = namedtuple(
+    "SerializerMeta", ("all_fields", "fields", "nested_fields", "values_fields")
+)
+
+# View classes with queryset plan caches
+_plan_cache_views = WeakSet()
+# Serializes evictions from plan caches shared by request threads
+_plan_cache_lock = Lock()
 
 
 class RequestQueryParserMixin(object):
@@ -62,14 +111,7 @@ class QueryArgumentsMixin(RequestQueryParserMixin):
                 pass
 
         # Else include all fields
-        query = Query(
-            field_name=None,
-            included_fields=["*"],
-            excluded_fields=[],
-            aliases={},
-            arguments={}
-        )
-        return query
+        return ALL_FIELDS_QUERY
 
     def build_query_params(self, parsed_query, parent=None):
         query_params = {}
@@ -151,6 +193,19 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
             return instance.pk
         return super().to_representation(instance)
 
+    @property
+    def _readable_fields(self):
+        if not self.is_ready_to_use_dynamic_fields:
+            return super()._readable_fields
+
+        # Fields don't change once dynamic fields are in use, so readable
+        # fields are collected once per serializer instead of once per object
+        readable_fields = self.__dict__.get("_restql_readable_fields")
+        if readable_fields is None:
+            readable_fields = tuple(super()._readable_fields)
+            self._restql_readable_fields = readable_fields
+        return readable_fields
+
     @cached_property
     def allowed_fields(self):
         fields = super().fields
@@ -245,6 +300,17 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
 
         include_all_fields = False  # Assume the * is not set initially
 
+        # Check that all included fields exist at once
+        # and report the first unknown field if any
+        included_field_names = [
+            field.field_name if isinstance(field, Query) else field
+            for field in included_fields
+            if field != "*"
+        ]
+        if set(included_field_names).difference(all_fields.keys()):
+            for field in included_field_names:
+                self.is_field_found(field, all_fields, raise_exception=True)
+
         # Go through all included fields to check if
         # they are all valid and to set `nested_fields`
         # property on parent fields for future reference
@@ -261,11 +327,6 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
                     field.field_name
                 )
 
-                self.is_field_found(
-                    field.field_name,
-                    all_fields,
-                    raise_exception=True
-                )
                 self.is_nested_field(
                     field.field_name,
                     all_fields[field.field_name],
@@ -275,7 +336,6 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
             else:
                 # Flat field
                 alias = parsed_query.aliases.get(field, field)
-                self.is_field_found(field, all_fields, raise_exception=True)
                 allowed_flat_fields.append(alias)
 
         def get_duplicates(items):
@@ -291,7 +351,7 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
         included_and_excluded_fields = (
             allowed_flat_fields +
             list(allowed_nested_fields.keys()) +
-            excluded_fields
+            list(excluded_fields)
         )
 
         including_or_excluding_field_more_than_once = (
@@ -428,6 +488,17 @@ class DynamicFieldsMixin(RequestQueryParserMixin):
 
 
 class EagerLoadingMixin(RequestQueryParserMixin):
+    # Class level mappings which are frozen when a view class is created
+    # so that they can be shared safely between requests
+    frozen_mappings = ("select_related", "prefetch_related")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attr in cls.frozen_mappings:
+            mapping = cls.__dict__.get(attr)
+            if isinstance(mapping, dict):
+                setattr(cls, attr, freeze_mapping(mapping))
+
     @property
     def parsed_restql_query(self):
         """
@@ -443,14 +514,7 @@ class EagerLoadingMixin(RequestQueryParserMixin):
                 pass
 
         # Else include all fields
-        query = Query(
-            field_name=None,
-            included_fields=["*"],
-            excluded_fields=[],
-            aliases={},
-            arguments={}
-        )
-        return query
+        return ALL_FIELDS_QUERY
 
     @property
     def should_auto_apply_eager_loading(self):
@@ -1045,18 +1109,43 @@ class NestedUpdateMixin(BaseNestedMixin):
 
 
 class OptimizedEagerLoadingMixin(EagerLoadingMixin):
+    frozen_mappings = EagerLoadingMixin.frozen_mappings + ("only",)
     only = {}
     always_apply_only = False
     force_query_usage = None
+    plan_cache_size = 256
+    response_cache_timeout = None
+    stream_chunk_size = None
     to_select = []
+    to_prefetch = []
     annotated_fields = []
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each view class keeps its own caches of queryset plans, keyed by
+        # parsed query objects and by query signatures respectively
+        cls._restql_query_plan_cache = {}
+        cls._restql_plan_cache = {}
+        # Columns loaded by `always_apply_only` when all fields are queried
+        cls._always_only_columns = {}
+        _plan_cache_views.add(cls)
+        # `only` mapping with values normalized to tuples of fields
+        cls._only_index = (cls.only, cls.build_only_index(cls.only))
+
     @property
     def should_always_apply_only(self):
         if hasattr(self, "always_apply_only"):
             return self.always_apply_only
         return False
 
+    @property
+    def should_auto_apply_eager_loading(self):
+        if self.request.method not in ("GET", "HEAD"):
+            # Writes work on single objects which need all their fields
+            # anyway, so optimizing their querysets is wasted work
+            return False
+        return super().should_auto_apply_eager_loading
+
     @property
     def should_force_query_usage(self):
         if self.force_query_usage is None:
@@ -1068,85 +1157,329 @@ class OptimizedEagerLoadingMixin(EagerLoadingMixin):
             return self.only
         return {}
 
-    def apply_eager_loading(self, queryset):
+    @staticmethod
+    def build_only_index(only_mapping):
+        return {
+            key: tuple(flatten([value]))
+            for key, value in only_mapping.items()
+        }
+
+    def get_only_index(self, only_mapping):
         """
-        Applies appropriate select_related and prefetch_related calls on a
-        queryset
+        Returns `only_mapping` with all values as tuples of fields
+        e.g `{"author_str": ("author__first_name",)}`.
+        """
+        mapping, only_index = self._only_index
+        if mapping is only_mapping:
+            # Normalized when the view class was created
+            return only_index
+        return self.build_only_index(only_mapping)
+
+    @classmethod
+    def get_query_signature(cls, query):
+        """
+        Returns a hashable signature of a dict parsed query.
+        """
+        return tuple(
+            (key, cls.get_query_signature(value) if isinstance(value, dict) else value)
+            for key, value in query.items()
+        )
+
+    def get_queryset_plan(self, model, parsed_query):
+        """
+        Returns a `QuerysetPlan` describing how a queryset of `model` should
+        be optimized for a parsed query. Plans are cached per view class since
+        they only depend on the query and the view configuration.
         """
-        query = self.get_dict_parsed_restql_query(self.parsed_restql_query)
         select_mapping = self.get_select_related_mapping()
         prefetch_mapping = self.get_prefetch_related_mapping()
+        only_mapping = self.get_only_mapping()
+        # Serializer fields may depend on the request, so plans are keyed
+        # by the fields rather than by the serializer class
+        serializer_meta = self.get_serializer_meta()
+
+        # Objects which are part of the cache keys by their ids, they are
+        # kept alive with the plan so that their ids can't be reused by
+        # other objects while it's cached
+        referenced = (parsed_query, select_mapping, prefetch_mapping, only_mapping)
+
+        config = (
+            get_language(),
+            model,
+            serializer_meta.all_fields,
+            tuple(serializer_meta.nested_fields.items()),
+            self.should_always_apply_only,
+            id(select_mapping),
+            id(prefetch_mapping),
+            id(only_mapping),
+        )
 
-        self.to_select = self.get_related_fields(select_mapping, query)
+        # Parsed queries are cached by the parser so the same query
+        # string usually gives the same object, which is the cheapest key
+        query_cache = self._restql_query_plan_cache
+        query_key = (id(parsed_query),) + config
+        try:
+            return query_cache[query_key][0]
+        except KeyError:
+            pass
+
+        query = self.get_dict_parsed_restql_query(parsed_query)
+        cache = self._restql_plan_cache
+        key = (self.get_query_signature(query),) + config
+        try:
+            plan = cache[key][0]
+        except KeyError:
+            plan = self.build_queryset_plan(
+                model, query, select_mapping, prefetch_mapping, only_mapping
+            )
+            self.cache_queryset_plan(cache, key, (plan,) + referenced)
+
+        self.cache_queryset_plan(query_cache, query_key, (plan,) + referenced)
+        return plan
+
+    def cache_queryset_plan(self, cache, key, entry):
+        if self.plan_cache_size <= 0:
+            # Caching plans is disabled
+            return
+        with _plan_cache_lock:
+            while len(cache) >= self.plan_cache_size:
+                # Drop the oldest plan
+                cache.pop(next(iter(cache), None), None)
+            cache[key] = entry
+
+    def build_queryset_plan(self, model, query, select_mapping,
+                            prefetch_mapping, only_mapping):
+        local_fields = self.get_local_only_fields(
+            model, query, select_mapping, prefetch_mapping, only_mapping
+        )
+        if local_fields is not None:
+            # Nothing to select or prefetch
+            return QuerysetPlan(
+                to_select=(),
+                to_prefetch=(),
+                only_select=(),
+                only_fields=self.without_pk(model, local_fields),
+            )
+
+        to_select = self.get_related_fields(select_mapping, query)
         to_prefetch = self.get_related_fields(prefetch_mapping, query)
+        to_prefetch = self.get_prefetch_with_only(
+            model, prefetch_mapping, query, to_prefetch
+        )
+        only_select, only_fields = self.get_only_fields(model, query, to_select)
+        # Relations joined by `to_select` lookups don't have to be selected again
+        only_select = [
+            relation for relation in only_select
+            if not any(
+                lookup == relation or lookup.startswith(relation + "__")
+                for lookup in to_select
+                if isinstance(lookup, str)
+            )
+        ]
+        return QuerysetPlan(
+            to_select=tuple(to_select),
+            to_prefetch=tuple(to_prefetch),
+            only_select=tuple(only_select),
+            only_fields=(
+                None if only_fields is None else self.without_pk(model, only_fields)
+            ),
+        )
 
-        if self.to_select:
-            queryset = queryset.select_related(*self.to_select)
-        if to_prefetch:
-            queryset = queryset.prefetch_related(*to_prefetch)
+    @staticmethod
+    def without_pk(model, fields):
+        """
+        Returns `fields` to pass to `.only()` without the primary key,
+        which is always loaded by Django anyway.
+        """
+        pk = model._meta.pk
+        pk_names = {"pk", pk.name, pk.attname}
+        fields = tuple(field for field in fields if field not in pk_names)
+        # `.only()` needs at least one field
+        return fields or (pk.name,)
+
+    def get_local_only_fields(self, model, query, select_mapping,
+                              prefetch_mapping, only_mapping):
+        """
+        Returns fields to pass to `.only()` if a dict parsed query selects
+        local(non relational) fields of `model` only, in which case no eager
+        loading is needed, otherwise returns None.
+        """
+        if "*" in query:
+            return None
+
+        local_fields = get_local_field_names(model)
+        related_keys = {key.split(".")[0] for key in select_mapping}
+        related_keys.update(key.split(".")[0] for key in prefetch_mapping)
 
-        return self.apply_only(queryset, query)
+        for key, value in query.items():
+            if value is not True or key not in local_fields:
+                return None
+            if key in related_keys or key in only_mapping:
+                return None
+
+        fields = self.parse_model_fields(model, query.keys())
+        if hasattr(model, "polymorphic_ctype"):
+            fields.append("polymorphic_ctype")
+        return fields
+
+    def get_prefetch_with_only(self, model, prefetch_mapping, query, to_prefetch):
+        """
+        Replaces plain prefetch lookups of relations queried with explicit
+        fields e.g `{posts{id}}` with `Prefetch` objects whose querysets
+        load only those fields. Relations queried with all fields load
+        only fields of their nested serializers.
+        """
+        prefetch_objects = {}
+        for key, lookup in prefetch_mapping.items():
+            if not isinstance(lookup, str) or "__" in lookup or "." in key:
+                continue
+            if any(
+                isinstance(other, str) and other.startswith(lookup + "__")
+                for other in to_prefetch
+            ):
+                # Nested lookups may need fields which wouldn't be loaded
+                continue
+
+            node = query.get(key)
+            if node is None and "*" in query:
+                node = {"*": True}
+            if not isinstance(node, dict):
+                continue
+            nested_keys = list(node.keys())
+            if any([nested_key.startswith("-") for nested_key in nested_keys]):
+                continue
+            if "*" in nested_keys:
+                nested_keys = self.get_serializer_meta().nested_fields.get(key)
+                if nested_keys is None:
+                    continue
+
+            relation = self.get_prefetch_relation(model, lookup)
+            if relation is None:
+                continue
+
+            related_model = relation.related_model
+            local_fields = get_local_field_names(related_model)
+            if not all(nested_key in local_fields for nested_key in nested_keys):
+                continue
+            fields = self.parse_model_fields(related_model, nested_keys)
+            if isinstance(relation, ManyToOneRel):
+                # Prefetched objects are matched to their parents by a foreign key
+                fields.append(relation.field.name)
+
+            queryset = related_model._default_manager.only(*fields)
+            prefetch_objects[lookup] = Prefetch(lookup, queryset=queryset)
+
+        if not prefetch_objects:
+            return to_prefetch
+        return [
+            prefetch_objects.get(lookup, lookup) if isinstance(lookup, str) else lookup
+            for lookup in to_prefetch
+        ]
+
+    @staticmethod
+    def get_prefetch_relation(model, lookup):
+        """
+        Returns a reverse foreign key or many to many relation of `model`
+        whose accessor is `lookup`, prefetched objects of other relations
+        e.g generic relations may need more fields than those which are
+        queried, so None is returned for them.
+        """
+        for field in model._meta.get_fields():
+            if isinstance(field, OneToOneRel):
+                continue
+            if isinstance(field, (ManyToOneRel, ManyToManyRel)):
+                if field.get_accessor_name() == lookup:
+                    return field
+            elif isinstance(field, ManyToManyField) and field.name == lookup:
+                return field
+        return None
+
+    def apply_eager_loading(self, queryset):
+        """
+        Applies appropriate select_related, prefetch_related and only calls
+        on a queryset
+        """
+        plan = self.get_queryset_plan(queryset.model, self.parsed_restql_query)
+        self.to_select = list(plan.to_select)
+        self.to_prefetch = list(plan.to_prefetch)
+
+        # Each call clones the queryset, applying all of them on one clone
+        # would need private `QuerySet` and `Query` internals which isn't
+        # worth saving two clones per request
+        if plan.to_select or plan.only_select:
+            queryset = queryset.select_related(*plan.to_select, *plan.only_select)
+        if plan.to_prefetch:
+            queryset = queryset.prefetch_related(*plan.to_prefetch)
+        if plan.only_fields is not None:
+            queryset = queryset.only(*plan.only_fields)
+        return queryset
 
     def apply_only(self, queryset, query):
         """
         Applies .only() on queryset with fields specified by user in query params.
         Exclude operator (-) is not being handled.
         """
-        serializer_fields = self.get_serializer().fields.keys()
+        only_select, only_fields = self.get_only_fields(
+            queryset.model, query, self.to_select
+        )
+        if only_select:
+            queryset = queryset.select_related(*only_select)
+        if only_fields is not None:
+            queryset = queryset.only(*only_fields)
+        return queryset
+
+    def get_only_fields(self, model, query, to_select):
+        """
+        Returns a `(to_select, fields)` pair for a dict parsed query where
+        `to_select` are extra relations to select for custom `only` fields
+        and `fields` are fields to pass to `.only()`. `fields` is None when
+        `.only()` shouldn't be applied.
+        """
         only_mapping = self.get_only_mapping()
-        model = queryset.model
+        only_index = self.get_only_index(only_mapping)
         fields_to_only = []
 
         if hasattr(model, "polymorphic_ctype"):
             fields_to_only.append("polymorphic_ctype")
 
-        if "*" in query.keys() or any([key.startswith("-") for key in query.keys()]):
+        if "*" in query or any(key.startswith("-") for key in query):
+            # All fields are queried so there's nothing to restrict
+            # unless `.only()` has to be applied anyway
             if self.should_always_apply_only:
-                to_select_fk_fields = {field.split("__")[0] for field in self.to_select}
-                only_mapping_values = flatten(only_mapping.values())
-                only_mapping_values_fk_fields = {
-                    field.split("__")[0]
-                    for field in only_mapping_values
-                    if field != "*"
-                }
-
-                all_fields = set(serializer_fields) - set(only_mapping.keys())
-                all_fields.update(to_select_fk_fields)
-                all_fields.update(only_mapping_values_fk_fields)
-                all_fields.update(fields_to_only)
-
-                all_fields = self.parse_model_fields(
-                    model, all_fields, skip_non_model_fields=False
+                to_select_fk_fields = [field.split("__")[0] for field in to_select]
+                # Dicts are used as ordered sets to keep the columns order stable
+                all_fields = dict.fromkeys(
+                    self.get_always_only_columns(model, only_mapping, only_index)
                 )
+                all_fields.update(dict.fromkeys(self.parse_model_fields(
+                    model, to_select_fk_fields + fields_to_only,
+                    skip_non_model_fields=False
+                )))
                 # Applying only on queryset with all serializer fields except custom
                 # fields from 'only_mapping' in order to check whether all custom fields
                 # are mapped correctly. Should throw FieldDoesNotExist otherwise.
-                queryset = queryset.only(*all_fields)
-            return queryset
+                return [], list(all_fields)
+            return [], None
 
         nested_fields_to_only = []
         custom_fields_to_only = []
-        to_select = set()
+        extra_to_select = {}
+        select_related_keys = self.get_select_related_mapping().keys()
+        model_fields = get_model_field_names(model)[0]
 
         for key, value in query.items():
             # Handling custom fields such as "SerializerMethodField"
             # or "StringRelatedField" by adding specified fields from "only" variable
             # and select related fk fields in case they were not
-            custom_only = only_mapping.get(key)
-            if custom_only and custom_only != "*":
-                custom_only = (
-                    custom_only
-                    if isinstance(custom_only, (list, tuple, set))
-                    else [custom_only]
-                )
+            custom_only = only_index.get(key)
+            if custom_only and custom_only != ("*",):
                 custom_fields_to_only += custom_only
 
                 for field in custom_only:
                     field_split = field.split("__")
-                    select_related_keys = self.get_select_related_mapping().keys()
                     field_in_select_related = field_split[0] in select_related_keys
                     if len(field_split) == 2 and field_in_select_related:
-                        to_select.add(field_split[0])
+                        extra_to_select[field_split[0]] = None
 
             if isinstance(value, dict):
                 nested_keys = list(value.keys())
@@ -1154,11 +1487,17 @@ class OptimizedEagerLoadingMixin(EagerLoadingMixin):
                     fields_to_only.append(key)
                 # Exclude operator not handled
                 elif any([nested_key.startswith("-") for nested_key in nested_keys]):
-                    return queryset
-                elif key not in only_mapping.keys():
+                    return [], None
+                elif key not in only_mapping:
+                    if key not in model_fields:
+                        # Not a model field, the serializer reports unknown fields
+                        continue
                     nested_field = model._meta.get_field(key)
-                    # Impossible to use .only on ManyToOneRel field
-                    if isinstance(nested_field, ManyToOneRel):
+                    if not nested_field.is_relation:
+                        continue
+                    # Impossible to use .only on ManyToOneRel or many to many fields,
+                    # these are loaded with prefetch_related
+                    if isinstance(nested_field, ManyToOneRel) or nested_field.many_to_many:
                         continue
 
                     nested_field_model = nested_field.related_model
@@ -1171,43 +1510,70 @@ class OptimizedEagerLoadingMixin(EagerLoadingMixin):
             else:
                 fields_to_only.append(key)
 
-        if to_select:
-            queryset = queryset.select_related(*to_select)
-
         fields_to_only = self.parse_model_fields(model, fields_to_only)
         fields_to_only += nested_fields_to_only
         fields_to_only += custom_fields_to_only
 
-        return queryset.only(*fields_to_only)
+        # Custom `only` fields may repeat fields which are queried directly
+        return list(extra_to_select), list(dict.fromkeys(fields_to_only))
+
+    def get_always_only_columns(self, model, only_mapping, only_index):
+        """
+        Returns fields of `model` to pass to `.only()` for serializer fields
+        and foreign keys used by custom `only` fields when all fields are
+        queried. They're computed once per view class, serializer fields
+        and language.
+        """
+        serializer_fields = self.get_serializer_meta().all_fields
+        key = (get_language(), model, serializer_fields, id(only_mapping))
+        try:
+            return self._always_only_columns[key][0]
+        except KeyError:
+            pass
+
+        only_mapping_values_fk_fields = [
+            field.split("__")[0]
+            for fields in only_index.values()
+            for field in fields
+            if field != "*"
+        ]
+        columns = dict.fromkeys(
+            field for field in serializer_fields
+            if field not in only_mapping
+        )
+        columns.update(dict.fromkeys(only_mapping_values_fk_fields))
+        columns = tuple(self.parse_model_fields(
+            model, columns, skip_non_model_fields=False
+        ))
+        # The mapping is kept alive so that its id can't be reused
+        self._always_only_columns[key] = (columns, only_mapping)
+        return columns
 
     def get_queryset(self):
-        query_param_name = restql_settings.QUERY_PARAM_NAME
-        query_in_params = self.request.query_params.get(query_param_name)
-        is_get_method = self.request.method == "GET"
-        if self.should_force_query_usage and is_get_method and not query_in_params:
-            raise ValidationError(
-                _(f"'{query_param_name}' must be defined in query params.")
-            )
+        # Settings are cached by `restql_settings` and reloaded when they
+        # change, cheaper checks go first so that most requests skip the rest
+        if self.request.method == "GET" and self.should_force_query_usage:
+            query_param_name = restql_settings.QUERY_PARAM_NAME
+            if not self.request.query_params.get(query_param_name):
+                raise ValidationError(
+                    _(f"'{query_param_name}' must be defined in query params.")
+                )
         queryset = super().get_queryset()
         return self.annotate_fields(queryset=queryset)
 
     def parse_model_fields(self, model, fields, skip_non_model_fields=True):
         results = []
         lang = get_language()
-        model_fields = {field.name for field in model._meta.get_fields()}
-        many_to_one_rel_fields = {
-            field.name
-            for field in model._meta.get_fields()
-            if isinstance(field, ManyToOneRel)
-        }
+        translated_fields = get_translated_fields(model)
+        model_fields, many_to_one_rel_fields = get_model_field_names(model)
 
         for field in fields:
             if field in many_to_one_rel_fields:
                 continue
 
             if field not in model_fields:
-                translated_field = f"{field}_{lang}"
-                if translated_field in model_fields:
+                translated_field = translated_fields.get(field, {}).get(lang)
+                if translated_field is not None:
                     results.append(translated_field)
                     continue
                 if skip_non_model_fields:
@@ -1216,6 +1582,295 @@ class OptimizedEagerLoadingMixin(EagerLoadingMixin):
 
         return results
 
+    def get_values_fields(self):
+        """
+        Returns names of fields to read with `.values()` if a list request
+        can be served without instantiating model objects and running them
+        through the serializer, otherwise returns None.
+        This is the case when all requested fields are annotated fields
+        or non relational model fields whose values are represented as
+        they are loaded from the database.
+        """
+        if self.request.method != "GET":
+            return None
+
+        serializer_class = self.get_serializer_class()
+        if not self.has_default_representation(serializer_class):
+            # Custom representation, the serializer must be used
+            return None
+
+        serializer_meta = self.get_serializer_meta()
+        fields = serializer_meta.fields
+        selected_fields = fields
+
+        if self.has_restql_query_param(self.request):
+            try:
+                parsed_query = self.get_parsed_restql_query_from_req(self.request)
+            except (SyntaxError, QueryFormatError):
+                # Let `DynamicFieldsMixin` report the error
+                return None
+
+            included_fields = parsed_query.included_fields
+            if parsed_query.aliases or parsed_query.excluded_fields:
+                return None
+            for field_name in included_fields:
+                if field_name == "*":
+                    continue
+                if not isinstance(field_name, str) or field_name not in fields:
+                    # Nested, unknown or write only fields
+                    # are handled by the serializer
+                    return None
+            if len(set(included_fields)) != len(included_fields):
+                return None
+            if "*" not in included_fields:
+                selected_fields = [
+                    field_name for field_name in selected_fields
+                    if field_name in included_fields
+                ]
+
+        model = serializer_class.Meta.model
+        values_fields = set(self.annotated_fields)
+        values_fields.add(model._meta.pk.name)
+        values_fields.update(
+            field.name
+            for field in model._meta.concrete_fields
+            if not field.is_relation
+        )
+        values_fields.intersection_update(serializer_meta.values_fields)
+
+        for field_name in selected_fields:
+            if field_name not in values_fields:
+                return None
+        return list(selected_fields) or None
+
+    @staticmethod
+    def has_default_representation(serializer_class):
+        """
+        Checks if `serializer_class` is a `DynamicFieldsMixin` serializer
+        whose objects and lists of objects are represented by DRF as they
+        are, i.e neither the serializer nor any of its bases other than
+        DRF serializers override `to_representation` and it uses the
+        default list serializer.
+        """
+        if not issubclass(serializer_class, DynamicFieldsMixin):
+            return False
+        meta = getattr(serializer_class, "Meta", None)
+        if getattr(meta, "list_serializer_class", ListSerializer) is not ListSerializer:
+            return False
+        for klass in serializer_class.__mro__:
+            if klass is DynamicFieldsMixin or klass.__module__.startswith("rest_framework."):
+                continue
+            if "to_representation" in klass.__dict__:
+                return False
+        return True
+
+    def get_serializer_meta(self):
+        """
+        Returns a `SerializerMeta` with names of all fields of the view's
+        serializer (`all_fields`), names of its readable fields (`fields`),
+        sources of fields of its nested serializers (`nested_fields`) and names
+        of fields which can be read with `.values()` as they are (`values_fields`).
+        It's computed once per request since serializer fields may depend on it.
+        """
+        serializer_meta = self.__dict__.get("_restql_serializer_meta")
+        if serializer_meta is not None:
+            return serializer_meta
+
+        serializer = self.get_serializer()
+        all_fields = serializer.fields
+        # Declared fields may represent model fields differently from
+        # fields generated for them e.g `CharField` on an integer column,
+        # only annotated fields are read as they are
+        declared_fields = set(getattr(serializer, "_declared_fields", ()))
+        declared_fields.difference_update(self.annotated_fields)
+        fields = {
+            field_name: field
+            for field_name, field in all_fields.items()
+            if not field.write_only
+        }
+        serializer_meta = SerializerMeta(
+            all_fields=tuple(all_fields),
+            fields=tuple(fields),
+            nested_fields=MappingProxyType({
+                field_name: self.get_nested_field_sources(field)
+                for field_name, field in fields.items()
+                if isinstance(getattr(field, "child", field), Serializer)
+            }),
+            values_fields=frozenset(
+                field_name
+                for field_name, field in fields.items()
+                if field.source == field_name
+                and field_name not in declared_fields
+                and self.is_values_field(field)
+            ),
+        )
+        self._restql_serializer_meta = serializer_meta
+        return serializer_meta
+
+    @classmethod
+    def get_nested_field_sources(cls, field):
+        """
+        Returns sources of readable fields of a nested serializer field
+        if they are all plain attributes, otherwise returns None.
+        """
+        serializer = getattr(field, "child", field)
+        return cls.get_serializer_sources(serializer.fields)
+
+    @staticmethod
+    def get_serializer_sources(fields):
+        sources = []
+        for field in fields.values():
+            if field.write_only:
+                continue
+            source = field.source
+            if source == "*" or "." in source or isinstance(
+                field, (Serializer, ListSerializer)
+            ):
+                return None
+            sources.append(source)
+        return tuple(sources)
+
+    @staticmethod
+    def is_values_field(field):
+        """
+        Checks if a serializer field represents values
+        loaded from the database without altering them.
+        """
+        if type(field) in VALUES_FIELD_CLASSES:
+            return True
+        if BigIntegerField is not None and type(field) is BigIntegerField:
+            return not getattr(
+                field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING
+            )
+        return False
+
+    def list(self, request, *args, **kwargs):
+        if self.response_cache_timeout is None:
+            return self.get_list_response(request, *args, **kwargs)
+
+        cache_key = self.get_response_cache_key(request)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            content, content_type = cached_response
+            return HttpResponse(content, content_type=content_type)
+
+        response = self.get_list_response(request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            def cache_response(response):
+                cache.set(
+                    cache_key,
+                    (response.content, response["Content-Type"]),
+                    self.response_cache_timeout
+                )
+            response.add_post_render_callback(cache_response)
+        return response
+
+    def get_response_cache_key(self, request):
+        """
+        Returns a cache key of a rendered list response. If
+        `RESPONSE_CACHE_INVALIDATION` setting is turned on, cached responses
+        are invalidated when instances of models returned by
+        `get_response_cache_models` are changed through the ORM, changes
+        made with `QuerySet.update()` or raw SQL aren't detected.
+        """
+        user = getattr(request, "user", None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        view_class = type(self)
+        key = repr((
+            get_generations(self.get_response_cache_models()),
+            f"{view_class.__module__}.{view_class.__qualname__}",
+            # Responses may contain absolute URLs e.g pagination links
+            request.build_absolute_uri(request.path),
+            sorted(request.query_params.lists()),
+            user_id,
+            request.accepted_media_type,
+            get_language(),
+        ))
+        digest = blake2b(key.encode(), digest_size=16).hexdigest()
+        return "restql:response:" + digest
+
+    def get_response_cache_models(self):
+        """
+        Returns models whose changes invalidate cached responses of the view,
+        which are the queryset model and models directly related to it.
+        Override it if responses depend on other models e.g relations of
+        related models used by nested serializers.
+        """
+        queryset = self.queryset
+        if queryset is None:
+            queryset = self.get_queryset()
+        return get_related_models(queryset.model)
+
+    def get_list_response(self, request, *args, **kwargs):
+        values_fields = self.get_values_fields()
+        if values_fields is None and self.stream_chunk_size is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if values_fields is None:
+            def get_data(objects):
+                return self.get_serializer(objects, many=True).data
+            has_prefetches = bool(self.to_prefetch)
+        else:
+            queryset = queryset.prefetch_related(None).values(*values_fields)
+            get_data = list
+            has_prefetches = False
+
+        if self.should_stream_response(has_prefetches):
+            return StreamingHttpResponse(
+                self.stream_list(queryset, get_data),
+                content_type=request.accepted_renderer.media_type
+            )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(get_data(page))
+        return Response(get_data(queryset))
+
+    def should_stream_response(self, has_prefetches):
+        """
+        Checks if a list response can be streamed, which requires
+        `stream_chunk_size` to be set, no pagination and a JSON renderer.
+        `has_prefetches` tells if eager loading prefetched related objects.
+        """
+        if self.stream_chunk_size is None or self.paginator is not None:
+            return False
+        if not isinstance(self.request.accepted_renderer, JSONRenderer):
+            return False
+        # Django < 4.1 ignores prefetch_related() when iterating in chunks
+        return DJANGO_VERSION >= (4, 1) or not has_prefetches
+
+    def stream_list(self, queryset, get_data):
+        """
+        Yields a JSON array of objects of a queryset which is
+        read and serialized in chunks of `stream_chunk_size` objects.
+        """
+        renderer = self.request.accepted_renderer
+        renderer_context = self.get_renderer_context()
+        accepted_media_type = self.request.accepted_media_type
+
+        separator = b"["
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(obj)
+            if len(chunk) < self.stream_chunk_size:
+                continue
+            content = renderer.render(
+                get_data(chunk), accepted_media_type, renderer_context
+            )
+            # Strip brackets of a rendered array to join it with other chunks
+            yield separator + content.strip()[1:-1]
+            separator = b","
+            chunk = []
+
+        if chunk:
+            content = renderer.render(
+                get_data(chunk), accepted_media_type, renderer_context
+            )
+            yield separator + content.strip()[1:-1]
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
     def annotate_fields(self, queryset: QuerySet) -> QuerySet:
         for field_name in self.annotated_fields:
             if self.should_annotate_field(field_name):
@@ -1223,6 +1878,29 @@ class OptimizedEagerLoadingMixin(EagerLoadingMixin):
 
         return queryset
 
+    @cached_property
+    def queried_field_names(self):
+        """
+        Names of fields included at the top level of the parsed query,
+        read once per request from the query parsed for the serializer.
+        """
+        return frozenset(
+            field.field_name if isinstance(field, Query) else field
+            for field in self.parsed_restql_query.included_fields
+        )
+
     def should_annotate_field(self, field_name: str) -> bool:
-        query = self.get_dict_parsed_restql_query(self.parsed_restql_query)
+        query = self.queried_field_names
         return "*" in query or field_name in query
+
+
+def reset_plan_caches(*args, **kwargs):
+    setting = kwargs['setting']
+    if setting in ('LANGUAGES', 'RESTQL'):
+        for view_class in _plan_cache_views:
+            view_class._restql_query_plan_cache.clear()
+            view_class._restql_plan_cache.clear()
+            view_class._always_only_columns.clear()
+
+
+setting_changed.connect(reset_plan_caches)
@@ -1,5 +1,8 @@
 import re
+import sys
 from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
 
 from pypeg2 import List, contiguous, csl, name, optional, parse
 
@@ -132,63 +135,201 @@ Query = namedtuple(
     ("field_name", "included_fields", "excluded_fields", "aliases", "arguments")
 )
 
+# Shared by all parsed query nodes without aliases or arguments
+EMPTY_MAPPING = MappingProxyType({})
+
+
+# Parsed form of a query which includes all fields i.e `{*}`
+ALL_FIELDS_QUERY = Query(
+    field_name=None,
+    included_fields=("*",),
+    excluded_fields=(),
+    aliases=EMPTY_MAPPING,
+    arguments=EMPTY_MAPPING
+)
+
+# Tokens of queries without arguments, which are parsed without pypeg,
+# a token is a field name, an excluded field or a punctuation character
+SIMPLE_QUERY_TOKEN_RE = re.compile(r"\s*(?:(\w+)|-(\w+)|([{}:,*]))")
+
+
+def _freeze(mapping):
+    if not mapping:
+        return EMPTY_MAPPING
+    return MappingProxyType(mapping)
+
+
+class _SimpleQueryError(Exception):
+    """Raised when a query can't be parsed without pypeg."""
+
 
 class QueryParser(object):
     def parse(self, query):
+        parser_class = type(self)
+        if parser_class.__init__ is not object.__init__:
+            # Parsers with custom initialization may hold per instance
+            # state, so they can't be replaced by a shared instance
+            return self._parse(query)
+        # Parsed queries are cached, so the same query
+        # string is parsed only once per parser class
+        return _parse_cached(parser_class, query)
+
+    def _parse(self, query):
+        simple_query = self._parse_simple_query(query)
+        if simple_query is not None:
+            return simple_query
+
         parse_tree = parse(query, Block)
         return self._transform_block(parse_tree, parent_field=None)
 
+    def _parse_simple_query(self, query):
+        """
+        Parses a query without arguments in a single pass over its tokens.
+        Returns None if the query has arguments or is invalid, such queries
+        are left to pypeg which also reports errors.
+        """
+        tokens = []
+        position = 0
+        end = len(query.rstrip())
+        while position < end:
+            match = SIMPLE_QUERY_TOKEN_RE.match(query, position)
+            if match is None:
+                return None
+            tokens.append(match.groups())
+            position = match.end()
+
+        try:
+            parsed_query, position = self._parse_simple_block(tokens, 0, None)
+        except (IndexError, _SimpleQueryError, QueryFormatError):
+            # Let pypeg parse the query again to report the right error
+            return None
+        if position != len(tokens):
+            return None
+        return parsed_query
+
+    def _parse_simple_block(self, tokens, position, parent_field):
+        """
+        Parses a block starting at `tokens[position]`, returns
+        the parsed block and the position of the next token.
+        """
+        included_fields = []
+        excluded_fields = []
+        # Allocated on the first alias, most blocks don't have any
+        aliases = None
+
+        if tokens[position][2] != "{":
+            raise _SimpleQueryError
+        position += 1
+
+        while True:
+            name, excluded_name, punctuation = tokens[position]
+            if punctuation == "}":
+                break
+            if punctuation == ",":
+                # A separator or a trailing comma
+                if not included_fields and not excluded_fields:
+                    if tokens[position + 1][2] != "}":
+                        raise _SimpleQueryError
+                position += 1
+                if tokens[position][2] == "}":
+                    break
+                name, excluded_name, punctuation = tokens[position]
+
+            position += 1
+            if excluded_name is not None:
+                excluded_fields.append(sys.intern(excluded_name))
+                continue
+            if punctuation == "*":
+                included_fields.append("*")
+                continue
+            if name is None:
+                raise _SimpleQueryError
+
+            alias = None
+            if tokens[position][2] == ":":
+                alias = name
+                name = tokens[position + 1][0]
+                if name is None:
+                    raise _SimpleQueryError
+                position += 2
+            name = sys.intern(name)
+            if alias is not None:
+                if aliases is None:
+                    aliases = {}
+                aliases[name] = sys.intern(alias)
+
+            if tokens[position][2] == "{":
+                # A parent field
+                field, position = self._parse_simple_block(tokens, position, name)
+                included_fields.append(field)
+            else:
+                included_fields.append(name)
+
+        return self._build_query(
+            parent_field, included_fields, excluded_fields, aliases, None
+        ), position + 1
+
     def _transform_block(self, block, parent_field=None):
-        query = Query(
-            field_name=parent_field,
-            included_fields=[],
-            excluded_fields=[],
-            aliases={},
-            arguments={}
-        )
+        included_fields = []
+        excluded_fields = []
+        aliases = {}
+        arguments = {}
 
         for argument in block.arguments:
             argument = {str(argument.name): argument.value}
-            query.arguments.update(argument)
+            arguments.update(argument)
 
         for field in block.body:
             # A field may be a parent or included field or excluded field
             if isinstance(field, (ParentField, IncludedField)):
                 # Find all aliases
                 if field.alias:
-                    query.aliases.update({str(field.name): str(field.alias)})
+                    aliases[str(field.name)] = str(field.alias)
 
             field = self._transform_field(field)
 
             if isinstance(field, Query):
                 # A field is a parent
-                query.included_fields.append(field)
+                included_fields.append(field)
             elif isinstance(field, IncludedField):
-                query.included_fields.append(str(field.name))
+                included_fields.append(str(field.name))
             elif isinstance(field, ExcludedField):
-                query.excluded_fields.append(str(field.name))
+                excluded_fields.append(str(field.name))
             elif isinstance(field, AllFields):
                 # include all fields
-                query.included_fields.append("*")
-
-        if query.excluded_fields and "*" not in query.included_fields:
-            query.included_fields.append("*")
-
-        field_names = set(query.aliases.values())
-        field_aliases = set(query.aliases.keys())
-        faulty_fields = field_names.intersection(field_aliases)
-        if faulty_fields:
-            # We check this here because if we let it pass during
-            # parsing it's going to raise inappropriate error message
-            # when checking fields availability(for the case of renamed parents)
-            msg = (
-                "You have either "
-                "used an existing field name as an alias to another field or "  # e.g {id, id: course{}}
-                "you have defined an alias with the same name as a field name."  # e.g {id: id}
-                "The list of fields which led to this error is %s."
-            ) % str(list(faulty_fields))
-            raise QueryFormatError(msg)
-        return query
+                included_fields.append("*")
+
+        return self._build_query(
+            parent_field, included_fields, excluded_fields, aliases, arguments
+        )
+
+    def _build_query(self, parent_field, included_fields, excluded_fields,
+                     aliases, arguments):
+        if excluded_fields and "*" not in included_fields:
+            included_fields.append("*")
+
+        if aliases:
+            faulty_fields = set(aliases.values()).intersection(aliases)
+            if faulty_fields:
+                # We check this here because if we let it pass during
+                # parsing it's going to raise inappropriate error message
+                # when checking fields availability(for the case of renamed parents)
+                msg = (
+                    "You have either "
+                    "used an existing field name as an alias to another field or "  # e.g {id, id: course{}}
+                    "you have defined an alias with the same name as a field name."  # e.g {id: id}
+                    "The list of fields which led to this error is %s."
+                ) % str(list(faulty_fields))
+                raise QueryFormatError(msg)
+
+        # Parsed queries are shared through the cache so make them read-only
+        return Query(
+            field_name=parent_field,
+            included_fields=tuple(included_fields),
+            excluded_fields=tuple(excluded_fields),
+            aliases=_freeze(aliases),
+            arguments=_freeze(arguments)
+        )
 
     def _transform_field(self, field):
         # A field may be a parent or included field or excluded field
@@ -201,3 +342,8 @@ class QueryParser(object):
             parent_field.block,
             parent_field=str(parent_field.name)
         )
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(parser_class, query):
+    return parser_class()._parse(query)
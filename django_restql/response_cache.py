@@ -0,0 +1,108 @@
+"""
+Support for caching rendered list responses of views which set
+`response_cache_timeout`. Cached responses are invalidated with per model
+generation counters which are part of cache keys, bumping a counter
+invalidates all responses which depend on its model at once.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.test.signals import setting_changed
+
+from .settings import restql_settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_DISPATCH_UID = "restql_response_cache_invalidation"
+
+GENERATION_KEY_PREFIX = "restql:response-generation:"
+
+
+def get_generation_key(model):
+    return GENERATION_KEY_PREFIX + model._meta.concrete_model._meta.label_lower
+
+
+def get_related_models(model):
+    """
+    Returns `model` and models related to it by forward
+    or reverse relations, whose changes affect its responses.
+    """
+    models = {model._meta.concrete_model: None}
+    for field in model._meta.get_fields():
+        if field.is_relation and field.related_model is not None:
+            models[field.related_model._meta.concrete_model] = None
+    return tuple(models)
+
+
+def get_generations(models):
+    """
+    Returns a tuple of current generations of `models`.
+    """
+    keys = [get_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, 0, None)
+            generations[key] = 0
+    return tuple(generations[key] for key in keys)
+
+
+def bump_generation(model):
+    key = get_generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter has expired or has been evicted
+        cache.add(key, 1, None)
+
+
+def bump_generations(*models):
+    # Writes must not fail because the cache is unavailable,
+    # stale responses expire with `response_cache_timeout` anyway
+    try:
+        for model in models:
+            bump_generation(model)
+    except Exception:
+        logger.warning(
+            "Failed to invalidate cached responses of %s", models, exc_info=True
+        )
+
+
+def invalidate_on_save_or_delete(sender, **kwargs):
+    bump_generations(sender)
+
+
+def invalidate_on_m2m_changed(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        bump_generations(type(instance), model)
+
+
+def connect_invalidation_receivers():
+    """
+    Invalidates cached responses whenever a model instance is saved or
+    deleted or a many to many relation is changed through the ORM,
+    if `RESPONSE_CACHE_INVALIDATION` setting is turned on. Called when
+    the app is loaded so that all processes which write to the
+    database invalidate responses, not only those serving them.
+    """
+    signals = (
+        (post_save, invalidate_on_save_or_delete),
+        (post_delete, invalidate_on_save_or_delete),
+        (m2m_changed, invalidate_on_m2m_changed),
+    )
+    enabled = restql_settings.RESPONSE_CACHE_INVALIDATION
+    for signal, receiver in signals:
+        if enabled:
+            signal.connect(receiver, dispatch_uid=INVALIDATION_DISPATCH_UID)
+        else:
+            signal.disconnect(receiver, dispatch_uid=INVALIDATION_DISPATCH_UID)
+
+
+def reconnect_invalidation_receivers(*args, **kwargs):
+    setting = kwargs['setting']
+    if setting == 'RESTQL':
+        connect_invalidation_receivers()
+
+
+setting_changed.connect(reconnect_invalidation_receivers)
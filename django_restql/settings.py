@@ -17,6 +17,7 @@ DEFAULTS = {
     'AUTO_APPLY_EAGER_LOADING': True,
     'MAX_ALIAS_LEN': 50,
     'FORCE_QUERY_USAGE': False,
+    'RESPONSE_CACHE_INVALIDATION': False,
 }
 
 
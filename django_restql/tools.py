@@ -1,10 +1,153 @@
-def flatten(items: [list, tuple, set]) -> list:
-    result = []
+from types import MappingProxyType
+from typing import Any, Iterable, List
 
-    for item in items:
-        if isinstance(item, (list, tuple, set)):
-            result += flatten(item)
-        else:
+from django.conf import settings
+from django.db.models import ManyToOneRel
+from django.test.signals import setting_changed
+
+
+def _flatten_into(result: List[Any], items: Iterable[Any]) -> None:
+    """Append all leaves of `items` to the `result` list in place."""
+    stack = [iter(items)]
+
+    # Walk nested lists, tuples and sets iteratively so that
+    # deeply nested items don't cost a function call per level
+    while stack:
+        for item in stack[-1]:
+            item_type = type(item)
+            if item_type is list or item_type is tuple or item_type is set:
+                stack.append(iter(item))
+                break
             result.append(item)
+        else:
+            stack.pop()
+
 
+def flatten(items: Iterable[Any]) -> List[Any]:
+    """
+    Returns a flat list of leaves of nested lists, tuples and sets.
+    Only exact list, tuple and set instances are flattened, instances
+    of their subclasses (e.g namedtuples) are treated as leaves.
+    """
+    # Copy once so that one-shot iterables can be scanned twice
+    items = list(items)
+    for item in items:
+        item_type = type(item)
+        if item_type is list or item_type is tuple or item_type is set:
+            break
+    else:
+        # Nothing is nested, which is the common case
+        return items
+
+    result = []
+    _flatten_into(result, items)
     return result
+
+
+def freeze_mapping(mapping):
+    """
+    Returns a read-only view of a copy of `mapping`, list values
+    are converted to tuples so that the result can be safely shared.
+    """
+    return MappingProxyType({
+        key: tuple(value) if value.__class__ is list else value
+        for key, value in mapping.items()
+    })
+
+
+# Per model field name caches, reset when `LANGUAGES` setting changes
+_translated_suffixes = None
+_translated_fields = {}
+_local_field_names = {}
+_model_field_names = {}
+
+
+def get_translated_suffixes():
+    """
+    Returns `(language_code, suffix)` pairs for all configured languages.
+    """
+    global _translated_suffixes
+    if _translated_suffixes is None:
+        _translated_suffixes = tuple(
+            (code, "_" + code) for code, __ in settings.LANGUAGES
+        )
+    return _translated_suffixes
+
+
+def get_translated_fields(model):
+    """
+    Returns a `{field_name: {language_code: translated_field_name}}` map
+    of fields which are translated on `model`,
+    e.g `{"title": {"en": "title_en", "pl": "title_pl"}}`.
+    """
+    try:
+        return _translated_fields[model]
+    except KeyError:
+        pass
+
+    translated_fields = {}
+    suffixes = get_translated_suffixes()
+    for field in model._meta.get_fields():
+        for code, suffix in suffixes:
+            if field.name.endswith(suffix) and len(field.name) > len(suffix):
+                name = field.name[:-len(suffix)]
+                translated_fields.setdefault(name, {})[code] = field.name
+
+    _translated_fields[model] = translated_fields
+    return translated_fields
+
+
+def get_local_field_names(model):
+    """
+    Returns names of non relational concrete fields of `model`,
+    including names of translated fields e.g `title` for `title_en`.
+    """
+    try:
+        return _local_field_names[model]
+    except KeyError:
+        pass
+
+    local_field_names = {
+        field.name
+        for field in model._meta.concrete_fields
+        if not field.is_relation
+    }
+    local_field_names.update(get_translated_fields(model))
+    local_field_names = frozenset(local_field_names)
+    _local_field_names[model] = local_field_names
+    return local_field_names
+
+
+def get_model_field_names(model):
+    """
+    Returns a `(field_names, many_to_one_rel_names)` pair of frozensets
+    with names of all fields of `model` and names of its reverse
+    foreign key relations.
+    """
+    try:
+        return _model_field_names[model]
+    except KeyError:
+        pass
+
+    fields = model._meta.get_fields()
+    model_field_names = (
+        frozenset(field.name for field in fields),
+        frozenset(
+            field.name for field in fields
+            if isinstance(field, ManyToOneRel)
+        ),
+    )
+    _model_field_names[model] = model_field_names
+    return model_field_names
+
+
+def reset_translated_fields(*args, **kwargs):
+    global _translated_suffixes
+    if kwargs['setting'] == 'LANGUAGES':
+        _translated_suffixes = None
+        _translated_fields.clear()
+        _local_field_names.clear()
+        _model_field_names.clear()
+
+
+setting_changed.connect(reset_translated_fields)
@@ -1,3 +1,5 @@
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from translated_fields import TranslatedField
 
@@ -70,3 +72,15 @@ class SampleEvent(models.Model):
     type = models.CharField(max_length=16)
     description = TranslatedField(models.TextField())
     place = models.ForeignKey(SamplePlace, on_delete=models.CASCADE)
+
+
+class SampleComment(models.Model):
+    text = models.TextField()
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+
+class SampleArticle(models.Model):
+    title = models.TextField()
+    comments = GenericRelation(SampleComment)
@@ -1,10 +1,22 @@
+import re
+import sys
+from functools import lru_cache
+
+# Matches quoted `"table"."column"` pairs in a SELECT clause
+FIELD_RE = re.compile(r'"([^"]+)"\."([^"]+)"')
+
+
+@lru_cache(maxsize=2048)
+def _parse_fields(select_clause, app_label_prefix):
+    fields = set()
+    for table, column in FIELD_RE.findall(select_clause):
+        if table.startswith(app_label_prefix):
+            table = table[len(app_label_prefix):]
+        fields.add(sys.intern(f"{table}.{column}"))
+    return frozenset(fields)
+
+
 def get_fields_queried(query_context, app_label_prefix="testapp_"):
     sql = query_context[0]["sql"]
-    fields = (
-        sql[sql.index('"'): sql.index("FROM")]
-        .replace('"', "")
-        .replace(" ", "")
-        .replace(app_label_prefix, "")
-        .split(",")
-    )
-    return set(fields)  # format: [ 'django_session.session_key', ... ]
+    # format: frozenset({ 'django_session.session_key', ... })
+    return _parse_fields(sql[:sql.index("FROM")], app_label_prefix)
@@ -1,6 +1,9 @@
+import json
+
 import pytest
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Value
 from django.db.models.functions import Concat
 from django.urls import path, reverse
@@ -9,9 +12,23 @@ from model_bakery import baker
 from rest_framework import serializers, status
 from rest_framework.generics import ListAPIView, UpdateAPIView
 
-from tests.testapp.models import SampleAuthor, SamplePost, SampleTag
+from tests.testapp.models import (
+    Genre, SampleArticle, SampleAuthor, SampleComment,
+    SampleEvent, SamplePlace, SamplePost, SampleTag
+)
 from tests.testapp.tests.helpers import get_fields_queried
 
+# Columns queried when all fields of `SamplePostSerializer` are loaded
+_EXPECTED_FULL_POST = frozenset({
+    "samplepost.id",
+    "samplepost.title",
+    "samplepost.author_id",
+    "samplepost.text",
+    "sampleauthor.id",
+    "sampleauthor.first_name",
+    "sampleauthor.last_name",
+})
+
 
 class SampleAuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
@@ -76,6 +93,65 @@ class SamplePostSmallSerializer(DynamicFieldsMixin, serializers.ModelSerializer)
         fields = ("id", "text")
 
 
+class SamplePostFirstLetterSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    first_letter = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SamplePost
+        fields = ("id", "first_letter")
+
+    def get_first_letter(self, obj):
+        return obj.title[0]
+
+
+class StaffSamplePostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SamplePost
+        fields = ("id", "title", "text")
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context["request"].query_params.get("staff"):
+            fields.pop("text")
+        return fields
+
+
+class SamplePostStringIdSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    id = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = SamplePost
+        fields = ("id", "text")
+        read_only_fields = fields
+
+
+class StampedSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["stamp"] = True
+        return data
+
+
+class StampedSamplePostSerializer(DynamicFieldsMixin, StampedSerializer):
+    class Meta:
+        model = SamplePost
+        fields = ("id", "text")
+
+
+class StampedListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        return [
+            dict(item, listed=True) for item in super().to_representation(data)
+        ]
+
+
+class SamplePostWithListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SamplePost
+        fields = ("id", "text")
+        list_serializer_class = StampedListSerializer
+
+
 class SampleViewSet(
     OptimizedEagerLoadingMixin,
     UpdateAPIView,
@@ -128,10 +204,57 @@ class SampleAuthorViewSet(
     always_apply_only = True
 
 
+class SampleEventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SampleEvent
+        fields = ("id", "type")
+
+
+class SamplePlaceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    events = SampleEventSerializer(many=True, source="sampleevent_set")
+
+    class Meta:
+        model = SamplePlace
+        fields = ("id", "slug", "events")
+
+
+class SamplePlaceViewSet(OptimizedEagerLoadingMixin, ListAPIView):
+    queryset = SamplePlace.objects.all()
+    serializer_class = SamplePlaceSerializer
+    permission_classes = []
+    prefetch_related = {"events": "sampleevent_set"}
+    pagination_class = None
+
+
+class SampleCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SampleComment
+        fields = ("id", "text")
+
+
+class SampleArticleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    comments = SampleCommentSerializer(many=True)
+
+    class Meta:
+        model = SampleArticle
+        fields = ("id", "title", "comments")
+
+
+class SampleArticleViewSet(OptimizedEagerLoadingMixin, ListAPIView):
+    queryset = SampleArticle.objects.all()
+    serializer_class = SampleArticleSerializer
+    permission_classes = []
+    prefetch_related = {"comments": "comments"}
+    pagination_class = None
+    always_apply_only = True
+
+
 urlpatterns = [
     path("", SampleViewSet.as_view(), name="view"),
     path("<int:pk>", SampleViewSet.as_view(), name="view-update"),
     path("authors/", SampleAuthorViewSet.as_view(), name="authors-view"),
+    path("places/", SamplePlaceViewSet.as_view(), name="places-view"),
+    path("articles/", SampleArticleViewSet.as_view(), name="articles-view"),
     path(
         "posts-with-annotation/",
         SamplePostWithAnnotationView.as_view(),
@@ -143,14 +266,39 @@ urlpatterns = [
 @pytest.mark.django_db
 @pytest.mark.urls(__name__)
 class TestOnlyInEagerLoading:
-    @pytest.fixture
-    def instance(self):
-        return baker.make(SamplePost)
+    @pytest.fixture(scope="class")
+    def instance(self, django_db_setup, django_db_blocker):
+        # Shared by all tests of the class, changes made by tests are
+        # rolled back with their own transactions which are nested in this one
+        with django_db_blocker.unblock(), transaction.atomic():
+            yield baker.make(SamplePost)
+            transaction.set_rollback(True)
 
     @pytest.fixture
     def url(self):
         return reverse("view")
 
+    @pytest.fixture(autouse=True)
+    def empty_plan_caches(self, monkeypatch):
+        # Plans cached by other tests must not affect queries checked here
+        for attr in (
+            "_restql_query_plan_cache", "_restql_plan_cache", "_always_only_columns"
+        ):
+            monkeypatch.setattr(SampleViewSet, attr, {})
+
+    @pytest.fixture
+    def plan_builds(self, monkeypatch):
+        """Counts queryset plans built by `SampleViewSet`."""
+        builds = []
+        build_queryset_plan = SampleViewSet.build_queryset_plan
+
+        def build(view, *args, **kwargs):
+            builds.append(args[0])
+            return build_queryset_plan(view, *args, **kwargs)
+
+        monkeypatch.setattr(SampleViewSet, "build_queryset_plan", build)
+        return builds
+
     def test_fields_correctly_selected(
         self, client, django_assert_max_num_queries, instance, url
     ):
@@ -169,45 +317,81 @@ class TestOnlyInEagerLoading:
         with django_assert_max_num_queries(1):
             client.get(url, {"query": "{title,author{id}}"})
 
+    def test_streamed_multiple_records(
+        self, client, django_assert_max_num_queries, instance, url, monkeypatch
+    ):
+        monkeypatch.setattr(SampleViewSet, "stream_chunk_size", 3)
+        posts = [instance, *baker.make(SamplePost, _quantity=5)]
+
+        with django_assert_max_num_queries(1):
+            response = client.get(url, {"query": "{id,author{id}}"})
+            data = json.loads(b"".join(response.streaming_content))
+        assert data == [
+            {"id": post.id, "author": {"id": post.author_id}} for post in posts
+        ]
+
     def test_no_query(self, client, django_assert_max_num_queries, instance, url):
         with django_assert_max_num_queries(1) as x:
             response = client.get(url)
             assert response.status_code == status.HTTP_200_OK
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
+
+    def test_using_all_fields(
+        self, client, django_assert_max_num_queries, instance, url
+    ):
+        with django_assert_max_num_queries(1) as x:
+            client.get(url, {"query": "{*}"})
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
+
+    def test_custom_only(self, client, django_assert_max_num_queries, instance, url):
+        with django_assert_max_num_queries(1) as x:
+            client.get(url, {"query": "{first_letter}"})
             expected_fields = {
                 "samplepost.id",
                 "samplepost.title",
-                "samplepost.author_id",
-                "samplepost.text",
-                "sampleauthor.id",
-                "sampleauthor.first_name",
-                "sampleauthor.last_name",
             }
             assert expected_fields == get_fields_queried(x)
 
-    def test_using_all_fields(
+    def test_custom_only_with_pk(
         self, client, django_assert_max_num_queries, instance, url
     ):
         with django_assert_max_num_queries(1) as x:
-            client.get(url, {"query": "{*}"})
+            response = client.get(url, {"query": "{id,first_letter}"})
+            assert response.status_code == status.HTTP_200_OK
             expected_fields = {
                 "samplepost.id",
                 "samplepost.title",
-                "samplepost.author_id",
-                "samplepost.text",
-                "sampleauthor.id",
-                "sampleauthor.first_name",
-                "sampleauthor.last_name",
             }
             assert expected_fields == get_fields_queried(x)
 
-    def test_custom_only(self, client, django_assert_max_num_queries, instance, url):
+    def test_custom_only_relation_selected_once(
+        self, client, django_assert_max_num_queries, instance, url
+    ):
         with django_assert_max_num_queries(1) as x:
-            client.get(url, {"query": "{first_letter}"})
+            response = client.get(url, {"query": "{author{id}, author_str}"})
+            assert response.status_code == status.HTTP_200_OK
             expected_fields = {
                 "samplepost.id",
-                "samplepost.title",
+                "samplepost.author_id",
+                "sampleauthor.id",
+                "sampleauthor.first_name",
             }
             assert expected_fields == get_fields_queried(x)
+            assert x[0]["sql"].count("JOIN") == 1
+
+    def test_all_fields_without_only(
+        self, client, django_assert_max_num_queries, instance, url, monkeypatch
+    ):
+        monkeypatch.setattr(SampleViewSet, "always_apply_only", False)
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", SamplePostFirstLetterSerializer
+        )
+
+        with django_assert_max_num_queries(1) as x:
+            response = client.get(url, {"query": "{*}"})
+            assert response.status_code == status.HTTP_200_OK
+            # All columns are loaded, not only those of serializer fields
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
 
     def test_custom_only_in_foreign_key(
         self, client, django_assert_max_num_queries, instance, url
@@ -242,16 +426,21 @@ class TestOnlyInEagerLoading:
         with django_assert_max_num_queries(1) as x:
             response = client.get(url, {"query": "{-text, author{-first_name}}"})
             assert response.status_code == status.HTTP_200_OK
-            expected_fields = {
-                "samplepost.id",
-                "samplepost.title",
-                "samplepost.author_id",
-                "samplepost.text",
-                "sampleauthor.id",
-                "sampleauthor.first_name",
-                "sampleauthor.last_name",
-            }
-            assert expected_fields == get_fields_queried(x)
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
+
+    @pytest.mark.parametrize("query", ["{-title}", "{*}", "{*, -text}"])
+    def test_all_fields_queries_load_serializer_columns(
+        self, client, django_assert_max_num_queries, instance, url, query
+    ):
+        # Computed once and shared by all queries which select all fields
+        with django_assert_max_num_queries(1) as x:
+            response = client.get(url, {"query": query})
+            assert response.status_code == status.HTTP_200_OK
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
+
+    def test_incorrect_nested_parameters(self, client, instance, url):
+        response = client.get(url, {"query": "{title, incorrect{id}}"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_incorrect_view(
         self, client, django_assert_max_num_queries, instance, url, monkeypatch
@@ -296,16 +485,7 @@ class TestOnlyInEagerLoading:
         with django_assert_max_num_queries(2) as x:
             response = client.get(url)
             assert response.status_code == status.HTTP_200_OK
-            expected_fields = {
-                "samplepost.id",
-                "samplepost.text",
-                "samplepost.title",
-                "samplepost.author_id",
-                "sampleauthor.id",
-                "sampleauthor.first_name",
-                "sampleauthor.last_name",
-            }
-            assert expected_fields == get_fields_queried(x)
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
 
     def test_no_query_only_serializer_fields(
         self, client, django_assert_max_num_queries, instance, url, monkeypatch
@@ -370,6 +550,32 @@ class TestOnlyInEagerLoading:
         response = client.put(url)
         assert response.status_code == status.HTTP_200_OK
 
+    def test_no_eager_loading_on_put_method(
+        self, client, django_assert_max_num_queries, instance, plan_builds
+    ):
+        url = reverse("view-update", args=(instance.id,))
+
+        with django_assert_max_num_queries(3) as x:
+            response = client.put(f"{url}?query={{title}}")
+            assert response.status_code == status.HTTP_200_OK
+            # The object is loaded as it is, without `.only()` or joins
+            expected_fields = {
+                "samplepost.id",
+                "samplepost.text",
+                "samplepost.title",
+                "samplepost.author_id",
+            }
+            assert expected_fields == get_fields_queried(x)
+        assert not plan_builds
+
+    def test_readable_fields_collected_once(self):
+        posts = baker.make(SamplePost, _quantity=2)
+        serializer = SamplePostSmallSerializer(posts, many=True, query="{id}")
+
+        assert serializer.data == [{"id": post.id} for post in posts]
+        readable_fields = serializer.child._restql_readable_fields
+        assert [field.field_name for field in readable_fields] == ["id"]
+
     def test_using_aliases(
         self, client, django_assert_max_num_queries, instance, url, settings
     ):
@@ -404,6 +610,170 @@ class TestOnlyInEagerLoading:
             }
             assert expected_fields == get_fields_queried(x)
 
+    def test_prefetch_only_queried_fields(
+        self, client, django_assert_max_num_queries, instance
+    ):
+        url = reverse("authors-view")
+
+        with django_assert_max_num_queries(2) as x:
+            response = client.get(url, {"query": "{first_name,posts{id}}"})
+            assert response.status_code == status.HTTP_200_OK
+            expected_fields = {
+                "samplepost.id",
+                "samplepost.author_id",
+            }
+            assert expected_fields == get_fields_queried(x.captured_queries[1:])
+
+    @pytest.mark.parametrize("query", ({}, {"query": "{*}"}, {"query": "{posts{*}}"}))
+    def test_prefetch_only_nested_serializer_fields(
+        self, client, django_assert_max_num_queries, instance, query
+    ):
+        url = reverse("authors-view")
+
+        with django_assert_max_num_queries(2) as x:
+            response = client.get(url, query)
+            assert response.status_code == status.HTTP_200_OK
+            expected_fields = {
+                "samplepost.id",
+                "samplepost.text",
+                "samplepost.author_id",
+            }
+            assert expected_fields == get_fields_queried(x.captured_queries[1:])
+
+    def test_prefetch_only_reverse_relation_by_accessor(
+        self, client, django_assert_max_num_queries
+    ):
+        place = baker.make(SamplePlace)
+        baker.make(SampleEvent, place=place, _quantity=2)
+        url = reverse("places-view")
+
+        with django_assert_max_num_queries(2) as x:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data[0]["events"]) == 2
+            expected_fields = {
+                "sampleevent.id",
+                "sampleevent.type",
+                "sampleevent.place_id",
+            }
+            assert expected_fields == get_fields_queried(x.captured_queries[1:])
+
+    def test_generic_relation_prefetched_with_all_fields(
+        self, client, django_assert_num_queries
+    ):
+        for article in baker.make(SampleArticle, _quantity=2):
+            baker.make(SampleComment, content_object=article, _quantity=2)
+        url = reverse("articles-view")
+
+        with django_assert_num_queries(2):
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert [len(item["comments"]) for item in response.data] == [2, 2]
+
+    @pytest.mark.parametrize(
+        "django_version, streamed", [((4, 0), False), ((4, 1), True)]
+    )
+    def test_streaming_with_prefetches(
+        self, client, monkeypatch, django_version, streamed
+    ):
+        # Django < 4.1 ignores prefetch_related() when iterating in chunks
+        monkeypatch.setattr("django_restql.mixins.DJANGO_VERSION", django_version)
+        monkeypatch.setattr(SampleArticleViewSet, "stream_chunk_size", 3)
+        for article in baker.make(SampleArticle, _quantity=2):
+            baker.make(SampleComment, content_object=article, _quantity=2)
+
+        response = client.get(reverse("articles-view"))
+        assert response.streaming is streamed
+        content = b"".join(response) if streamed else response.content
+        assert [len(item["comments"]) for item in json.loads(content)] == [2, 2]
+
+    def test_queryset_plan_is_cached(
+        self, client, django_assert_max_num_queries, instance, url, plan_builds
+    ):
+        queries = []
+        # The same query and the same query shape in a different string
+        for query in ("{title,author{id}}", "{title,author{id}}", "{title, author{id}}"):
+            with django_assert_max_num_queries(1) as x:
+                client.get(url, {"query": query})
+            queries.append(x[0]["sql"])
+        assert len(set(queries)) == 1
+        assert len(plan_builds) == 1
+
+        client.get(url, {"query": "{title}"})
+        assert len(plan_builds) == 2
+
+    def test_queryset_plan_cache_disabled(
+        self, client, django_assert_max_num_queries, instance, url, monkeypatch
+    ):
+        monkeypatch.setattr(SampleViewSet, "plan_cache_size", 0)
+
+        with django_assert_max_num_queries(1) as x:
+            response = client.get(url, {"query": "{title,author{id}}"})
+            assert response.status_code == status.HTTP_200_OK
+            expected_fields = {
+                "samplepost.id",
+                "samplepost.author_id",
+                "samplepost.title",
+                "sampleauthor.id",
+            }
+            assert expected_fields == get_fields_queried(x)
+
+    def test_queryset_plan_follows_per_request_serializer_fields(
+        self, client, django_assert_num_queries, instance, url, monkeypatch
+    ):
+        def get_serializer(view, *args, **kwargs):
+            if view.request.query_params.get("short"):
+                kwargs["fields"] = ("id", "title")
+            return SamplePostSerializer(*args, **kwargs)
+
+        monkeypatch.setattr(SampleViewSet, "get_serializer", get_serializer)
+        response = client.get(url, {"short": "1"})
+        assert response.data == [{"id": instance.id, "title": instance.title}]
+
+        with django_assert_num_queries(1) as x:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert _EXPECTED_FULL_POST == get_fields_queried(x)
+
+    @pytest.mark.parametrize("staff_first", [True, False])
+    def test_request_dependent_serializer_fields(
+        self, client, instance, url, monkeypatch, staff_first
+    ):
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", StaffSamplePostSerializer
+        )
+        staff_data = {"id": instance.id, "title": instance.title, "text": instance.text}
+        data = {"id": instance.id, "title": instance.title}
+
+        requests = [({"staff": "1"}, staff_data), ({}, data)]
+        if not staff_first:
+            requests.reverse()
+        for query_params, expected_data in requests * 2:
+            response = client.get(url, query_params)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data == [expected_data]
+
+    def test_drf_settings_change_applied_to_values(
+        self, client, instance, url, settings
+    ):
+        response = client.get(url, {"query": "{id, text}"})
+        assert response.data == [{"id": instance.id, "text": instance.text}]
+
+        settings.REST_FRAMEWORK = {"COERCE_BIGINT_TO_STRING": True}
+        response = client.get(url, {"query": "{id, text}"})
+        assert response.data == [{"id": str(instance.id), "text": instance.text}]
+
+    def test_queryset_plan_cache_reset_on_settings_change(
+        self, client, instance, url, settings, plan_builds
+    ):
+        client.get(url, {"query": "{title}"})
+        client.get(url, {"query": "{title}"})
+        assert len(plan_builds) == 1
+
+        settings.RESTQL = {"AUTO_APPLY_EAGER_LOADING": True}
+        client.get(url, {"query": "{title}"})
+        assert len(plan_builds) == 2
+
     def test_many_to_one_rel_ignored_when_no_query(
         self, client, django_assert_max_num_queries, instance
     ):
@@ -418,6 +788,133 @@ class TestOnlyInEagerLoading:
             }
             assert expected_fields == get_fields_queried(x)
 
+    def test_read_only_fields_read_without_serializer(
+        self, client, instance, url, monkeypatch
+    ):
+        def to_representation(*args, **kwargs):
+            raise AssertionError("Serializer should not be used")
+
+        monkeypatch.setattr(DynamicFieldsMixin, "to_representation", to_representation)
+        response = client.get(url, {"query": "{id, text}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{"id": instance.id, "text": instance.text}]
+
+    def test_declared_field_on_model_field_used(self, client, instance, url, monkeypatch):
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", SamplePostStringIdSerializer
+        )
+        response = client.get(url, {"query": "{id, text}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"id": str(instance.id), "text": instance.text}]
+
+    def test_custom_base_representation_used(self, client, instance, url, monkeypatch):
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", StampedSamplePostSerializer
+        )
+        response = client.get(url, {"query": "{id, text}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [
+            {"id": instance.id, "text": instance.text, "stamp": True}
+        ]
+
+    def test_custom_list_serializer_used(self, client, instance, url, monkeypatch):
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", SamplePostWithListSerializer
+        )
+        response = client.get(url, {"query": "{id, text}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [
+            {"id": instance.id, "text": instance.text, "listed": True}
+        ]
+
+    def test_response_cache(
+        self, client, django_assert_num_queries, instance, url, monkeypatch,
+        settings
+    ):
+        settings.ALLOWED_HOSTS = ["testserver", "other.example.com"]
+        settings.RESTQL = {"RESPONSE_CACHE_INVALIDATION": True}
+        monkeypatch.setattr(SampleViewSet, "response_cache_timeout", 60)
+        query = {"query": "{id,title}"}
+
+        with django_assert_num_queries(1):
+            response = client.get(url, query)
+        with django_assert_num_queries(0):
+            cached_response = client.get(url, query)
+        assert cached_response.status_code == status.HTTP_200_OK
+        assert cached_response.content == response.content
+
+        # Responses are cached per host since they may contain absolute URLs
+        with django_assert_num_queries(1):
+            client.get(url, query, HTTP_HOST="other.example.com")
+
+        # Changes of models which responses don't depend on are ignored
+        baker.make(Genre)
+        with django_assert_num_queries(0):
+            client.get(url, query)
+
+        # Saving a model instance invalidates cached responses
+        baker.make(SamplePost)
+        with django_assert_num_queries(1):
+            response = client.get(url, query)
+        assert len(response.json()) == 2
+
+        instance.author.save()
+        with django_assert_num_queries(1):
+            client.get(url, query)
+
+    def test_response_cache_invalidation_disabled(
+        self, client, django_assert_num_queries, instance, url, monkeypatch
+    ):
+        cache.clear()
+        monkeypatch.setattr(SampleViewSet, "response_cache_timeout", 60)
+        query = {"query": "{id,title}"}
+
+        with django_assert_num_queries(1):
+            client.get(url, query)
+
+        # Cached responses are kept until they expire
+        baker.make(SamplePost)
+        with django_assert_num_queries(0):
+            response = client.get(url, query)
+        assert len(response.json()) == 1
+
+    def test_response_cache_invalidation_cache_error(
+        self, client, django_assert_num_queries, url, monkeypatch, settings
+    ):
+        settings.RESTQL = {"RESPONSE_CACHE_INVALIDATION": True}
+
+        def incr(*args, **kwargs):
+            raise ConnectionError("Cache is unavailable")
+
+        # Cache errors don't prevent saving model instances
+        monkeypatch.setattr(cache, "incr", incr)
+        post = baker.make(SamplePost)
+        assert SamplePost.objects.filter(pk=post.pk).exists()
+
+    def test_flat_serializer_read_without_serializer(
+        self, client, django_assert_max_num_queries, instance, url, monkeypatch
+    ):
+        def to_representation(*args, **kwargs):
+            raise AssertionError("Serializer should not be used")
+
+        monkeypatch.setattr(DynamicFieldsMixin, "to_representation", to_representation)
+        monkeypatch.setattr(
+            SampleViewSet, "serializer_class", SamplePostSmallSerializer
+        )
+
+        with django_assert_max_num_queries(1) as x:
+            response = client.get(url)
+            assert response.data == [{"id": instance.id, "text": instance.text}]
+            expected_fields = {
+                "samplepost.id",
+                "samplepost.text",
+            }
+            assert expected_fields == get_fields_queried(x)
+
 
 @pytest.mark.django_db
 @pytest.mark.urls(__name__)
@@ -451,3 +948,16 @@ class TestSamplePostWithAnnotationView:
                 "samplepost.id",
             }
             assert expected_fields == get_fields_queried(x)
+
+    def test_annotated_fields_read_without_serializer(self, client, url, monkeypatch):
+        baker.make(SamplePost, author__first_name="John", author__last_name="Doe")
+
+        def to_representation(*args, **kwargs):
+            raise AssertionError("Serializer should not be used")
+
+        monkeypatch.setattr(DynamicFieldsMixin, "to_representation", to_representation)
+        response = client.get(url, {"query": "{id, author_full_name}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["author_full_name"] == "John Doe"
+        assert list(response.data[0]) == ["id", "author_full_name"]
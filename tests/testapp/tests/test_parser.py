@@ -0,0 +1,21 @@
+from django_restql.parser import QueryParser
+
+
+class PrefixedQueryParser(QueryParser):
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def _parse(self, query):
+        return super()._parse("{%s%s}" % (self.prefix, query))
+
+
+def test_parsed_queries_are_shared():
+    query = "{id,author{name}}"
+    assert QueryParser().parse(query) is QueryParser().parse(query)
+
+
+def test_parser_with_custom_init_is_not_cached():
+    first = PrefixedQueryParser("id,").parse("name")
+    second = PrefixedQueryParser("title,").parse("name")
+    assert first.included_fields == ("id", "name")
+    assert second.included_fields == ("title", "name")